@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Bake the JSON catalog into an importable Python module.
+
+Running this after editing catalog.json writes scripts/catalog_baked.py
+with the validated specs as ready-made DSubSpec instances, so load_specs
+can skip parsing and validation entirely. The baked module records the
+source file's mtime and is ignored automatically once the JSON changes.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from generate_svgs import CATALOG_PATH, load_specs
+
+BAKED_PATH = Path(__file__).resolve().parent / "catalog_baked.py"
+
+
+def main() -> int:
+    specs = load_specs()
+
+    lines = [
+        '"""Generated by bake_catalog.py - do not edit; rerun after catalog changes."""',
+        "",
+        "from generate_svgs import DSubSpec",
+        "",
+        f"CATALOG_MTIME_NS = {CATALOG_PATH.stat().st_mtime_ns}",
+        "",
+        "SPECS = (",
+    ]
+    for spec in specs:
+        lines.append(f"    {spec!r},")
+    lines += [")", ""]
+
+    BAKED_PATH.write_text("\n".join(lines), encoding="utf-8")
+    print(f"Baked {len(specs)} specs to {BAKED_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
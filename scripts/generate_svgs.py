@@ -7,19 +7,24 @@ Output units are millimeters (mm).
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import math
+import os
 import re
+import sys
 import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 
 
 Point = Tuple[float, float]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DSubSpec:
     label: str
     file_tag: str
@@ -39,6 +44,10 @@ class DSubSpec:
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CATALOG_PATH = PROJECT_ROOT / "src" / "data" / "catalog.json"
 
+# Hash of the generator source itself: any code edit invalidates cached SVGs.
+GENERATOR_VERSION = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+CACHE_MANIFEST_NAME = ".svg_cache.json"
+
 
 SHELL_GEOMETRY: Dict[str, Dict[str, Dict[str, float]]] = {
     "E": {"male": {"opening_top_w": 16.90, "opening_h": 8.30, "flange_h": 12.50},
@@ -54,64 +63,58 @@ SHELL_GEOMETRY: Dict[str, Dict[str, Dict[str, float]]] = {
 }
 
 
+# Pre-baked scaffold fragments: only the handful of numeric values vary
+# per drawing, so the constant attribute soup is formatted, not rebuilt.
+_SVG_HEADER = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{w}mm" height="{h}mm" '
+    'viewBox="0 0 {w} {h}">'
+    '<rect x="0" y="0" width="{w}" height="{h}" fill="white" /><g>'
+).format
+_SVG_FOOTER = "</g></svg>"
+_FLANGE_RECT = (
+    '<rect x="{x}" y="{y}" width="{w}" height="{h}" rx="1.2" ry="1.2" '
+    'fill="none" stroke="black" stroke-width="0.3" />'
+).format
+_OPENING_GROUP = (
+    '<g transform="translate({x} {y})">'
+    '<path d="{d}" fill="none" stroke="black" stroke-width="0.25" /></g>'
+).format
+
+
+@functools.lru_cache(maxsize=8192)
 def fmt(x: float) -> str:
-    s = f"{x:.2f}"
-    return s.rstrip("0").rstrip(".")
-
-
-def svg_el(tag: str, **attrs) -> ET.Element:
-    el = ET.Element(tag)
-    for k, v in attrs.items():
-        if v is None:
-            continue
-        el.set(k.replace("_", "-"), str(v))
-    return el
-
-
-def add_line(parent: ET.Element, x1: float, y1: float, x2: float, y2: float,
-             sw: float = 0.25, dash: str | None = None) -> None:
-    a = {"x1": fmt(x1), "y1": fmt(y1), "x2": fmt(x2), "y2": fmt(y2),
-         "stroke": "black", "stroke_width": fmt(sw), "fill": "none"}
-    if dash:
-        a["stroke_dasharray"] = dash
-    parent.append(svg_el("line", **a))
-
-
-def add_circle(parent: ET.Element, cx: float, cy: float, r: float,
+    # Coordinates repeat heavily (pitch multiples, fixed margins, stroke
+    # widths), so memoizing pays for itself across a full catalog build.
+    # Integer decode of hundredths avoids the format-then-strip dance.
+    # round(x, 2) first so ties fall exactly as the decimal conversion
+    # would place them; scaling alone drifts on near-half values.
+    n = round(round(x, 2) * 100)
+    if n == 0:
+        return "0"
+    sign = "-" if n < 0 else ""
+    q, r = divmod(abs(n), 100)
+    if r == 0:
+        return f"{sign}{q}"
+    if r % 10 == 0:
+        return f"{sign}{q}.{r // 10}"
+    return f"{sign}{q}.{r:02d}"
+
+
+def add_circle(parts: List[str], cx: float, cy: float, r: float,
                sw: float = 0.25, fill: str = "white") -> None:
-    parent.append(svg_el("circle", cx=fmt(cx), cy=fmt(cy), r=fmt(r),
-                         stroke="black", stroke_width=fmt(sw), fill=fill))
+    parts.append(
+        f'<circle cx="{fmt(cx)}" cy="{fmt(cy)}" r="{fmt(r)}" '
+        f'stroke="black" stroke-width="{fmt(sw)}" fill="{fill}" />')
 
 
-def add_text(parent: ET.Element, x: float, y: float, text: str,
+def add_text(parts: List[str], x: float, y: float, text: str,
              size: float = 2.2, anchor: str = "middle", baseline: str = "middle",
              weight: str | None = None) -> None:
-    t = svg_el("text",
-               x=fmt(x), y=fmt(y),
-               fill="black",
-               font_size=fmt(size),
-               text_anchor=anchor,
-               dominant_baseline=baseline,
-               font_family="Arial, Helvetica, sans-serif")
-    if weight:
-        t.set("font-weight", weight)
-    t.text = text
-    parent.append(t)
-
-
-def add_arrow(parent: ET.Element, x: float, y: float, direction: str, size: float = 0.9) -> None:
-    if direction == "left":
-        pts = [(x, y), (x + size, y - size / 2), (x + size, y + size / 2)]
-    elif direction == "right":
-        pts = [(x, y), (x - size, y - size / 2), (x - size, y + size / 2)]
-    elif direction == "up":
-        pts = [(x, y), (x - size / 2, y + size), (x + size / 2, y + size)]
-    elif direction == "down":
-        pts = [(x, y), (x - size / 2, y - size), (x + size / 2, y - size)]
-    else:
-        raise ValueError(direction)
-    pts_str = " ".join(f"{fmt(px)},{fmt(py)}" for px, py in pts)
-    parent.append(svg_el("polygon", points=pts_str, fill="black", stroke="black", stroke_width="0"))
+    bold = f' font-weight="{weight}"' if weight else ""
+    parts.append(
+        f'<text x="{fmt(x)}" y="{fmt(y)}" fill="black" font-size="{fmt(size)}" '
+        f'text-anchor="{anchor}" dominant-baseline="{baseline}" '
+        f'font-family="Arial, Helvetica, sans-serif"{bold}>{escape(text)}</text>')
 
 
 def rounded_polygon_path(points: Sequence[Point], radius: float) -> str:
@@ -119,15 +122,14 @@ def rounded_polygon_path(points: Sequence[Point], radius: float) -> str:
     if len(pts) < 3:
         raise ValueError("Need >=3 points")
 
-    def dist(a: Point, b: Point) -> float:
-        return math.hypot(a[0] - b[0], a[1] - b[1])
-
-    def unit(vx: float, vy: float) -> Tuple[float, float]:
-        d = math.hypot(vx, vy)
-        return (0.0, 0.0) if d == 0 else (vx / d, vy / d)
+    # Pure-Python kernel, kept tight: math functions are bound locally and
+    # the edge lengths double as the unit-vector divisors.
+    hypot, acos, tan = math.hypot, math.acos, math.tan
 
     n = len(pts)
-    cmds: List[str] = []
+    # Flat token list, joined once at the end — no per-corner f-strings.
+    tokens: List[str] = []
+    radius_s = fmt(radius)
 
     for i in range(n):
         p_prev = pts[(i - 1) % n]
@@ -136,63 +138,133 @@ def rounded_polygon_path(points: Sequence[Point], radius: float) -> str:
 
         v1x, v1y = p_prev[0] - p_curr[0], p_prev[1] - p_curr[1]
         v2x, v2y = p_next[0] - p_curr[0], p_next[1] - p_curr[1]
-        u1x, u1y = unit(v1x, v1y)
-        u2x, u2y = unit(v2x, v2y)
+        d1 = hypot(v1x, v1y)
+        d2 = hypot(v2x, v2y)
+        u1x, u1y = (0.0, 0.0) if d1 == 0 else (v1x / d1, v1y / d1)
+        u2x, u2y = (0.0, 0.0) if d2 == 0 else (v2x / d2, v2y / d2)
 
         dot = max(-1.0, min(1.0, u1x * u2x + u1y * u2y))
-        ang = math.acos(dot)
+        ang = acos(dot)
         if ang == 0:
             continue
 
-        t = radius / math.tan(ang / 2.0)
-        t = min(t, dist(p_curr, p_prev) * 0.49, dist(p_curr, p_next) * 0.49)
+        t = radius / tan(ang / 2.0)
+        t = min(t, d1 * 0.49, d2 * 0.49)
 
         p_start = (p_curr[0] + u1x * t, p_curr[1] + u1y * t)
         p_end = (p_curr[0] + u2x * t, p_curr[1] + u2y * t)
 
-        if i == 0:
-            cmds.append(f"M {fmt(p_start[0])} {fmt(p_start[1])}")
-        else:
-            cmds.append(f"L {fmt(p_start[0])} {fmt(p_start[1])}")
-
         cross = u1x * u2y - u1y * u2x
-        sweep = 1 if cross < 0 else 0
-        cmds.append(f"A {fmt(radius)} {fmt(radius)} 0 0 {sweep} {fmt(p_end[0])} {fmt(p_end[1])}")
-
-    cmds.append("Z")
-    return " ".join(cmds)
-
-
-def dim_horizontal(parent: ET.Element, x1: float, x2: float, y_dim: float, y_ref: float, text: str) -> None:
-    add_line(parent, x1, y_ref, x1, y_dim, sw=0.18)
-    add_line(parent, x2, y_ref, x2, y_dim, sw=0.18)
-    add_line(parent, x1, y_dim, x2, y_dim, sw=0.18)
-    add_arrow(parent, x1, y_dim, "right", size=0.8)
-    add_arrow(parent, x2, y_dim, "left", size=0.8)
-    add_text(parent, (x1 + x2) / 2, y_dim - 1.2, text, size=2.0, anchor="middle", baseline="alphabetic")
-
+        tokens += ("M" if not tokens else "L", fmt(p_start[0]), fmt(p_start[1]),
+                   "A", radius_s, radius_s, "0", "0", "1" if cross < 0 else "0",
+                   fmt(p_end[0]), fmt(p_end[1]))
 
-def dim_vertical(parent: ET.Element, y1: float, y2: float, x_dim: float, x_ref: float, text: str) -> None:
-    add_line(parent, x_ref, y1, x_dim, y1, sw=0.18)
-    add_line(parent, x_ref, y2, x_dim, y2, sw=0.18)
-    add_line(parent, x_dim, y1, x_dim, y2, sw=0.18)
-    add_arrow(parent, x_dim, y1, "down", size=0.8)
-    add_arrow(parent, x_dim, y2, "up", size=0.8)
-    add_text(parent, x_dim + 1.2, (y1 + y2) / 2, text, size=2.0, anchor="start", baseline="middle")
+    tokens.append("Z")
+    return " ".join(tokens)
 
 
-def dim_h_simple(parent: ET.Element, x1: float, x2: float, y: float, text: str) -> None:
-    add_line(parent, x1, y, x2, y, sw=0.18, dash="2 1")
-    add_arrow(parent, x1, y, "right", size=0.75)
-    add_arrow(parent, x2, y, "left", size=0.75)
-    add_text(parent, (x1 + x2) / 2, y - 1.0, text, size=1.8, anchor="middle", baseline="alphabetic")
+@functools.lru_cache(maxsize=64)
+def opening_path_for(top_w: float, bottom_w: float, opening_h: float, corner_r: float) -> str:
+    """Origin-centered keystone opening path.
 
+    The trapezoid depends only on shell size, gender, and pin bounds — all
+    spec-invariant — so the path is cached and re-positioned per drawing
+    with an SVG translate instead of re-running the corner trig.
 
-def dim_v_simple_left(parent: ET.Element, y1: float, y2: float, x: float, text: str) -> None:
-    add_line(parent, x, y1, x, y2, sw=0.18, dash="2 1")
-    add_arrow(parent, x, y1, "down", size=0.75)
-    add_arrow(parent, x, y2, "up", size=0.75)
-    add_text(parent, x - 1.0, (y1 + y2) / 2, text, size=1.8, anchor="end", baseline="middle")
+    Closed form for the symmetric keystone: both top corners share one
+    interior angle and both bottom corners the other, so only two tangent
+    lengths are needed and the arc points follow analytically. The general
+    rounded_polygon_path is kept for arbitrary outlines.
+    """
+    th = top_w / 2.0
+    bh = bottom_w / 2.0
+    ty = -opening_h / 2.0
+    by = opening_h / 2.0
+
+    run = th - bh
+    slant = math.hypot(run, opening_h)
+    ux, uy = run / slant, opening_h / slant
+
+    t_top = min(corner_r / math.tan(math.acos(ux) / 2.0), slant * 0.49, top_w * 0.49)
+    t_bot = min(corner_r / math.tan(math.acos(-ux) / 2.0), slant * 0.49, bottom_w * 0.49)
+
+    r_s = fmt(corner_r)
+    arc = ("A", r_s, r_s, "0", "0", "1")
+    tokens = (
+        "M", fmt(-th + ux * t_top), fmt(ty + uy * t_top),
+        *arc, fmt(-th + t_top), fmt(ty),
+        "L", fmt(th - t_top), fmt(ty),
+        *arc, fmt(th - ux * t_top), fmt(ty + uy * t_top),
+        "L", fmt(bh + ux * t_bot), fmt(by - uy * t_bot),
+        *arc, fmt(bh - t_bot), fmt(by),
+        "L", fmt(-bh + t_bot), fmt(by),
+        *arc, fmt(-bh - ux * t_bot), fmt(by - uy * t_bot),
+        "Z",
+    )
+    return " ".join(tokens)
+
+
+# Each dimension helper emits its fixed handful of elements as one append;
+# shared coordinate strings are formatted once.
+
+def dim_horizontal(parts: List[str], x1: float, x2: float, y_dim: float, y_ref: float, text: str) -> None:
+    s = 0.8
+    sx1, sx2 = fmt(x1), fmt(x2)
+    syd, syr = fmt(y_dim), fmt(y_ref)
+    ya, yb = fmt(y_dim - s / 2), fmt(y_dim + s / 2)
+    parts.append(
+        f'<line x1="{sx1}" y1="{syr}" x2="{sx1}" y2="{syd}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<line x1="{sx2}" y1="{syr}" x2="{sx2}" y2="{syd}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<line x1="{sx1}" y1="{syd}" x2="{sx2}" y2="{syd}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<polygon points="{sx1},{syd} {fmt(x1 - s)},{ya} {fmt(x1 - s)},{yb}" fill="black" stroke="black" stroke-width="0" />'
+        f'<polygon points="{sx2},{syd} {fmt(x2 + s)},{ya} {fmt(x2 + s)},{yb}" fill="black" stroke="black" stroke-width="0" />'
+        f'<text x="{fmt((x1 + x2) / 2)}" y="{fmt(y_dim - 1.2)}" fill="black" font-size="2" '
+        f'text-anchor="middle" dominant-baseline="alphabetic" '
+        f'font-family="Arial, Helvetica, sans-serif">{escape(text)}</text>')
+
+
+def dim_vertical(parts: List[str], y1: float, y2: float, x_dim: float, x_ref: float, text: str) -> None:
+    s = 0.8
+    sy1, sy2 = fmt(y1), fmt(y2)
+    sxd, sxr = fmt(x_dim), fmt(x_ref)
+    xa, xb = fmt(x_dim - s / 2), fmt(x_dim + s / 2)
+    parts.append(
+        f'<line x1="{sxr}" y1="{sy1}" x2="{sxd}" y2="{sy1}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<line x1="{sxr}" y1="{sy2}" x2="{sxd}" y2="{sy2}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<line x1="{sxd}" y1="{sy1}" x2="{sxd}" y2="{sy2}" stroke="black" stroke-width="0.18" fill="none" />'
+        f'<polygon points="{sxd},{sy1} {xa},{fmt(y1 - s)} {xb},{fmt(y1 - s)}" fill="black" stroke="black" stroke-width="0" />'
+        f'<polygon points="{sxd},{sy2} {xa},{fmt(y2 + s)} {xb},{fmt(y2 + s)}" fill="black" stroke="black" stroke-width="0" />'
+        f'<text x="{fmt(x_dim + 1.2)}" y="{fmt((y1 + y2) / 2)}" fill="black" font-size="2" '
+        f'text-anchor="start" dominant-baseline="middle" '
+        f'font-family="Arial, Helvetica, sans-serif">{escape(text)}</text>')
+
+
+def dim_h_simple(parts: List[str], x1: float, x2: float, y: float, text: str) -> None:
+    s = 0.75
+    sx1, sx2, sy = fmt(x1), fmt(x2), fmt(y)
+    ya, yb = fmt(y - s / 2), fmt(y + s / 2)
+    parts.append(
+        f'<line x1="{sx1}" y1="{sy}" x2="{sx2}" y2="{sy}" stroke="black" stroke-width="0.18" '
+        f'fill="none" stroke-dasharray="2 1" />'
+        f'<polygon points="{sx1},{sy} {fmt(x1 - s)},{ya} {fmt(x1 - s)},{yb}" fill="black" stroke="black" stroke-width="0" />'
+        f'<polygon points="{sx2},{sy} {fmt(x2 + s)},{ya} {fmt(x2 + s)},{yb}" fill="black" stroke="black" stroke-width="0" />'
+        f'<text x="{fmt((x1 + x2) / 2)}" y="{fmt(y - 1.0)}" fill="black" font-size="1.8" '
+        f'text-anchor="middle" dominant-baseline="alphabetic" '
+        f'font-family="Arial, Helvetica, sans-serif">{escape(text)}</text>')
+
+
+def dim_v_simple_left(parts: List[str], y1: float, y2: float, x: float, text: str) -> None:
+    s = 0.75
+    sy1, sy2, sx = fmt(y1), fmt(y2), fmt(x)
+    xa, xb = fmt(x - s / 2), fmt(x + s / 2)
+    parts.append(
+        f'<line x1="{sx}" y1="{sy1}" x2="{sx}" y2="{sy2}" stroke="black" stroke-width="0.18" '
+        f'fill="none" stroke-dasharray="2 1" />'
+        f'<polygon points="{sx},{sy1} {xa},{fmt(y1 - s)} {xb},{fmt(y1 - s)}" fill="black" stroke="black" stroke-width="0" />'
+        f'<polygon points="{sx},{sy2} {xa},{fmt(y2 + s)} {xb},{fmt(y2 + s)}" fill="black" stroke="black" stroke-width="0" />'
+        f'<text x="{fmt(x - 1.0)}" y="{fmt((y1 + y2) / 2)}" fill="black" font-size="1.8" '
+        f'text-anchor="end" dominant-baseline="middle" '
+        f'font-family="Arial, Helvetica, sans-serif">{escape(text)}</text>')
 
 
 def distribute_pins(pin_count: int, rows: int) -> List[int]:
@@ -247,155 +319,218 @@ def row_offsets_for_counts(counts: List[int], h_pitch: float, stagger: List[floa
     return offsets
 
 
+@dataclass(frozen=True, slots=True)
+class PinLayout:
+    """Structure-of-arrays pin layout.
+
+    Pins are stored row-major, left to right in the canonical orientation;
+    pin number n is simply index + 1. row_starts has rows + 1 entries so the
+    pins of row r are the slice [row_starts[r]:row_starts[r + 1]].
+    """
+    xs: List[float]
+    ys: List[float]
+    row_starts: List[int]
+
+
+@functools.lru_cache(maxsize=64)
+def _default_layout(pin_count: int, rows: int, h: float) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Derived row counts and offsets for specs that omit them.
+
+    The catalog has only a handful of distinct (pins, rows, pitch) keys, so
+    the distribute/offset passes run once per key.
+    """
+    counts = distribute_pins(pin_count, rows)
+    shifts = [(h / 2.0 if (idx % 2 == 1) else 0.0) for idx in range(rows)]
+    return tuple(counts), tuple(row_offsets_for_counts(counts, h, shifts))
+
+
 def generate_pin_positions(
     pin_count: int,
     rows: int,
     h: float,
     v: float,
-    view: str,
-    gender: str,
     row_counts: Optional[List[int]] = None,
     row_offsets: Optional[List[float]] = None,
-) -> List[Dict[str, float | int]]:
-    counts = row_counts or distribute_pins(pin_count, rows)
+) -> PinLayout:
+    """Centered pin layout in the canonical orientation (male, mating face)."""
+    if row_counts is None and row_offsets is None:
+        counts, row_offsets = _default_layout(pin_count, rows, h)
+    else:
+        counts = row_counts or distribute_pins(pin_count, rows)
     if sum(counts) != pin_count:
         raise ValueError(f"row_counts sum {sum(counts)} != pin_count {pin_count}")
     if len(counts) != rows:
         raise ValueError(f"row_counts length {len(counts)} != rows {rows}")
 
-    shifts = [(h / 2.0 if (idx % 2 == 1) else 0.0) for idx in range(rows)]
     if row_offsets is None:
+        shifts = [(h / 2.0 if (idx % 2 == 1) else 0.0) for idx in range(rows)]
         row_offsets = row_offsets_for_counts(counts, h, shifts)
     elif len(row_offsets) != rows:
         raise ValueError(f"row_offsets length {len(row_offsets)} != rows {rows}")
 
-    pins: List[Dict[str, float | int]] = []
-    n = 1
+    xs: List[float] = []
+    ys: List[float] = []
+    row_starts: List[int] = [0]
     for r, cnt in enumerate(counts):
-        for i in range(cnt):
-            pins.append({"n": n, "row": r, "x": i * h + row_offsets[r], "y": r * v})
-            n += 1
+        off = row_offsets[r]
+        xs.extend(i * h + off for i in range(cnt))
+        ys.extend([r * v] * cnt)
+        row_starts.append(row_starts[-1] + cnt)
 
-    min_x = min(float(p["x"]) for p in pins)
-    max_x = max(float(p["x"]) for p in pins)
-    min_y = min(float(p["y"]) for p in pins)
-    max_y = max(float(p["y"]) for p in pins)
-    cx = (min_x + max_x) / 2.0
-    cy = (min_y + max_y) / 2.0
+    cx = (min(xs) + max(xs)) / 2.0
+    cy = (min(ys) + max(ys)) / 2.0
+    xs = [x - cx for x in xs]
+    ys = [y - cy for y in ys]
 
-    for p in pins:
-        p["x"] = float(p["x"]) - cx
-        p["y"] = float(p["y"]) - cy
+    return PinLayout(xs=xs, ys=ys, row_starts=row_starts)
 
-    # Pin 1 position convention:
-    # - Male (plug), mating face: Pin 1 at top-LEFT
-    # - Female (receptacle), mating face: Pin 1 at top-RIGHT
-    # For female, we mirror the X coordinates to flip pin positions
-    if gender == "female":
-        for p in pins:
-            p["x"] = -float(p["x"])
 
-    # Solder side view: looking from behind, so mirror X again
-    if view == "solder":
-        for p in pins:
-            p["x"] = -float(p["x"])
+def orient_pins(base: PinLayout, gender: str, view: str) -> PinLayout:
+    """Mirror the canonical layout into the requested gender/view orientation.
 
-    return pins
+    Pin 1 position convention:
+    - Male (plug), mating face: Pin 1 at top-LEFT
+    - Female (receptacle), mating face: Pin 1 at top-RIGHT
+    The solder side view looks from behind, so it mirrors X once more.
+    The two mirrors cancel, leaving a single conditional X flip.
+    """
+    if (gender == "female") != (view == "solder"):
+        return PinLayout(xs=[-x for x in base.xs], ys=base.ys, row_starts=base.row_starts)
+    return base
+
+
+def precompute_pins(spec: DSubSpec) -> PinLayout:
+    """Spec-invariant pin layout, shared by all four gender/view variants."""
+    return generate_pin_positions(
+        spec.pin_count,
+        spec.rows,
+        spec.h_pitch_mm,
+        spec.v_pitch_mm,
+        row_counts=spec.row_counts,
+        row_offsets=spec.row_offsets,
+    )
+
+
+# Maps anything outside [a-z0-9_] to "_" in a single C-level pass.
+_STEM_TRANS = str.maketrans({
+    c: "_" for c in map(chr, range(256))
+    if not ("a" <= c <= "z" or "0" <= c <= "9" or c == "_")
+})
+# The table only covers Latin-1; anything above U+00FF is folded first so
+# the contract stays identical to the original [^a-z0-9] regex.
+_NON_LATIN1 = re.compile(r"[^\x00-\xff]")
+_MULTI_UNDERSCORE = re.compile(r"_+")
 
 
 def sanitize_stem(stem: str) -> str:
-    stem = stem.strip().lower()
-    stem = re.sub(r"[^a-z0-9]+", "_", stem)
-    stem = re.sub(r"_+", "_", stem).strip("_")
-    return stem
+    stem = _NON_LATIN1.sub("_", stem.strip().lower()).translate(_STEM_TRANS)
+    return _MULTI_UNDERSCORE.sub("_", stem).strip("_")
+
 
+@dataclass(frozen=True, slots=True)
+class ShellCtx:
+    """Placement context shared by both views of a (spec, gender)."""
+    ox: float
+    oy: float
+    cx: float
+    cy: float
+    outer_w: float
+    outer_h: float
+    opening_h_eff: float
+    caption_y: float
 
-def generate_svg(spec: DSubSpec, gender: str, view: str, include_caption: bool = True) -> str:
-    margin_left, margin_right, margin_top, margin_bottom = 38.0, 38.0, 30.0, 28.0
 
+# Drawing layout invariants: page margins around the flange, clearance
+# between the pin field and the opening wall, and the tangent of the 10
+# degree keystone side angle.
+_MARGIN_LEFT, _MARGIN_RIGHT = 38.0, 38.0
+_MARGIN_TOP, _MARGIN_BOTTOM = 30.0, 28.0
+_CLEARANCE_X, _CLEARANCE_Y = 3.0, 2.8
+_SIDE_TAN = math.tan(math.radians(10.0))
+
+_shell_cache: Dict[Tuple[str, str], Tuple[str, str, ShellCtx]] = {}
+
+
+def _shell_fragments(spec: DSubSpec, gender: str, base_pins: PinLayout) -> Tuple[str, str, ShellCtx]:
+    """View-invariant fragments for one (spec, gender).
+
+    The header, flange, mounting holes, opening, and outer dimension
+    annotations are identical for the outside and solder views, so they are
+    built once and cached as two prebuilt strings plus the placement context.
+    """
+    # Keyed by the spec's full contents (mirroring _job_key), so a spec
+    # edited under an unchanged id can never be served stale fragments.
+    key = (repr(spec), gender)
+    cached = _shell_cache.get(key)
+    if cached is not None:
+        return cached
+
+    shell = SHELL_GEOMETRY[spec.shell_size][gender]
     outer_w = spec.flange_outer_width_mm
-    outer_h = spec.shell_height_mm or SHELL_GEOMETRY[spec.shell_size][gender]["flange_h"]
-    opening_top_w = SHELL_GEOMETRY[spec.shell_size][gender]["opening_top_w"]
-    opening_h = SHELL_GEOMETRY[spec.shell_size][gender]["opening_h"]
+    outer_h = spec.shell_height_mm or shell["flange_h"]
+    opening_top_w = shell["opening_top_w"]
+    opening_h = shell["opening_h"]
     hole_pitch = spec.mounting_hole_pitch_mm
 
-    width = margin_left + outer_w + margin_right
-    height = margin_top + outer_h + margin_bottom
+    width = _MARGIN_LEFT + outer_w + _MARGIN_RIGHT
+    height = _MARGIN_TOP + outer_h + _MARGIN_BOTTOM
 
-    svg = svg_el(
-        "svg",
-        xmlns="http://www.w3.org/2000/svg",
-        width=f"{fmt(width)}mm",
-        height=f"{fmt(height)}mm",
-        viewBox=f"0 0 {fmt(width)} {fmt(height)}",
-    )
+    prefix: List[str] = [_SVG_HEADER(w=fmt(width), h=fmt(height))]
 
-    svg.append(svg_el("rect", x="0", y="0", width=fmt(width), height=fmt(height), fill="white"))
-    g = svg_el("g")
-    svg.append(g)
-
-    ox, oy = margin_left, margin_top
+    ox, oy = _MARGIN_LEFT, _MARGIN_TOP
     cx, cy = ox + outer_w / 2.0, oy + outer_h / 2.0
 
-    g.append(svg_el(
-        "rect",
-        x=fmt(ox), y=fmt(oy),
-        width=fmt(outer_w), height=fmt(outer_h),
-        rx=fmt(1.2), ry=fmt(1.2),
-        fill="none", stroke="black", stroke_width=fmt(0.30),
-    ))
+    prefix.append(_FLANGE_RECT(x=fmt(ox), y=fmt(oy), w=fmt(outer_w), h=fmt(outer_h)))
 
     hole_dia = spec.screw_hole_dia_mm or 4.0
     hole_r = hole_dia / 2.0
     hcx1 = cx - hole_pitch / 2.0
     hcx2 = cx + hole_pitch / 2.0
-    add_circle(g, hcx1, cy, hole_r, sw=0.25, fill="none")
-    add_circle(g, hcx2, cy, hole_r, sw=0.25, fill="none")
+    add_circle(prefix, hcx1, cy, hole_r, sw=0.25, fill="none")
+    add_circle(prefix, hcx2, cy, hole_r, sw=0.25, fill="none")
 
-    pins = generate_pin_positions(
-        spec.pin_count,
-        spec.rows,
-        spec.h_pitch_mm,
-        spec.v_pitch_mm,
-        view=view,
-        gender=gender,
-        row_counts=spec.row_counts,
-        row_offsets=spec.row_offsets,
-    )
-
-    pxs = [float(p["x"]) for p in pins]
-    pys = [float(p["y"]) for p in pins]
-    pin_min_x, pin_max_x = min(pxs), max(pxs)
-    pin_min_y, pin_max_y = min(pys), max(pys)
-    pin_w = (pin_max_x - pin_min_x)
-    pin_h = (pin_max_y - pin_min_y)
-
-    side_angle_deg = 10.0
-    clearance_x = 3.0
-    clearance_y = 2.8
+    # Pin bounds are mirror-invariant, so the opening geometry is too.
+    pin_w = max(base_pins.xs) - min(base_pins.xs)
+    pin_h = max(base_pins.ys) - min(base_pins.ys)
 
-    opening_h_eff = max(opening_h, pin_h + 2 * clearance_y)
-    opening_top_w_eff = max(opening_top_w, pin_w + 2 * clearance_x)
+    opening_h_eff = max(opening_h, pin_h + 2 * _CLEARANCE_Y)
+    opening_top_w_eff = max(opening_top_w, pin_w + 2 * _CLEARANCE_X)
 
     # D-Sub "keystone" shape: top is WIDER, bottom is NARROWER
     top_w = min(opening_top_w_eff, outer_w - 6.0)
-    bottom_w = top_w - 2.0 * math.tan(math.radians(side_angle_deg)) * opening_h_eff
-    bottom_w = max(bottom_w, pin_w + clearance_x)  # Ensure pins still fit
-
-    top_y = cy - opening_h_eff / 2.0
-    bot_y = cy + opening_h_eff / 2.0
-    top_half = top_w / 2.0
-    bot_half = bottom_w / 2.0
-
-    trap_pts = [
-        (cx - top_half, top_y),
-        (cx + top_half, top_y),
-        (cx + bot_half, bot_y),
-        (cx - bot_half, bot_y),
-    ]
+    bottom_w = top_w - 2.0 * _SIDE_TAN * opening_h_eff
+    bottom_w = max(bottom_w, pin_w + _CLEARANCE_X)  # Ensure pins still fit
+
     corner_r = min(2.2, opening_h_eff * 0.22, top_w * 0.18)
-    opening_path = rounded_polygon_path(trap_pts, corner_r)
-    g.append(svg_el("path", d=opening_path, fill="none", stroke="black", stroke_width=fmt(0.25)))
+    opening_path = opening_path_for(top_w, bottom_w, opening_h_eff, corner_r)
+    prefix.append(_OPENING_GROUP(x=fmt(cx), y=fmt(cy), d=opening_path))
+
+    dims: List[str] = []
+    dim_horizontal(dims, ox, ox + outer_w, oy - 16.0, oy, f"{outer_w:.2f} mm")
+    dim_horizontal(dims, hcx1, hcx2, oy + outer_h + 16.0, cy, f"{hole_pitch:.2f} mm")
+    dim_vertical(dims, oy, oy + outer_h, ox + outer_w + 18.0, ox + outer_w, f"{outer_h:.2f} mm")
+
+    ctx = ShellCtx(ox=ox, oy=oy, cx=cx, cy=cy, outer_w=outer_w, outer_h=outer_h,
+                   opening_h_eff=opening_h_eff,
+                   caption_y=oy + outer_h + _MARGIN_BOTTOM - 8.0)
+    result = ("".join(prefix), "".join(dims), ctx)
+    _shell_cache[key] = result
+    return result
+
+
+def generate_svg(spec: DSubSpec, gender: str, view: str, include_caption: bool = True,
+                 base_pins: Optional[PinLayout] = None) -> str:
+    if base_pins is None:
+        base_pins = precompute_pins(spec)
+    prefix, outer_dims, ctx = _shell_fragments(spec, gender, base_pins)
+    ox, oy = ctx.ox, ctx.oy
+    cx, cy = ctx.cx, ctx.cy
+    outer_w = ctx.outer_w
+    opening_h_eff = ctx.opening_h_eff
+
+    pins = orient_pins(base_pins, gender, view)
+
+    g: List[str] = [prefix]
 
     if spec.rows == 2:
         pin_r = 0.55
@@ -403,55 +538,68 @@ def generate_svg(spec: DSubSpec, gender: str, view: str, include_caption: bool =
         pin_r = 0.45
     else:
         pin_r = 0.40
+    # One shared circle in <defs>; each pin is a <use> reference, so the
+    # radius and shared attributes appear once per document.
     pin_fill = "black" if gender == "male" else "white"
-    for p in pins:
-        x = cx + float(p["x"])
-        y = cy + float(p["y"])
-        add_circle(g, x, y, pin_r, sw=0.18, fill=pin_fill)
+    g.append(f'<defs><circle id="pin" r="{fmt(pin_r)}" /></defs>')
+    g.append(f'<g stroke="black" stroke-width="{fmt(0.18)}" fill="{pin_fill}">')
+    for x, y in zip(pins.xs, pins.ys):
+        g.append(f'<use href="#pin" x="{fmt(cx + x)}" y="{fmt(cy + y)}" />')
+    g.append("</g>")
+
+    # One x-ordered index list per row, reused by the pin labels and every
+    # dimension annotation below. Rows are contiguous slices of the layout
+    # and monotonic in x (ascending canonically, descending when mirrored),
+    # so ordering is a slice plus an optional reverse — no sort needed.
+    row_orders = []
+    for r in range(spec.rows):
+        s, e = pins.row_starts[r], pins.row_starts[r + 1]
+        order = list(range(s, e))
+        if pins.xs[s] > pins.xs[e - 1]:
+            order.reverse()
+        row_orders.append(order)
 
     label_x_pad = 4.0
     for r in range(spec.rows):
-        row_pins = sorted([p for p in pins if int(p["row"]) == r], key=lambda pp: float(pp["x"]))
-        left_pin = row_pins[0]
-        right_pin = row_pins[-1]
-        y = cy + float(left_pin["y"])
-
-        add_text(g, ox - label_x_pad, y, str(int(left_pin["n"])), size=2.2, anchor="end", weight="bold")
-        add_text(g, ox + outer_w + label_x_pad, y, str(int(right_pin["n"])), size=2.2, anchor="start", weight="bold")
-
-    dim_horizontal(g, ox, ox + outer_w, oy - 16.0, oy, f"{outer_w:.2f} mm")
-    dim_horizontal(g, hcx1, hcx2, oy + outer_h + 16.0, cy, f"{hole_pitch:.2f} mm")
-    dim_vertical(g, oy, oy + outer_h, ox + outer_w + 18.0, ox + outer_w, f"{outer_h:.2f} mm")
-
-    top_row = sorted([p for p in pins if int(p["row"]) == 0], key=lambda pp: float(pp["x"]))
-    if len(top_row) >= 2:
-        x1 = cx + float(top_row[0]["x"])
-        x2 = cx + float(top_row[1]["x"])
-        y = cy + float(top_row[0]["y"]) - 6.5
+        order = row_orders[r]
+        left_i, right_i = order[0], order[-1]
+        y = cy + pins.ys[left_i]
+
+        add_text(g, ox - label_x_pad, y, str(left_i + 1), size=2.2, anchor="end", weight="bold")
+        add_text(g, ox + outer_w + label_x_pad, y, str(right_i + 1), size=2.2, anchor="start", weight="bold")
+
+    g.append(outer_dims)
+
+    order0 = row_orders[0]
+    if len(order0) >= 2:
+        x1 = cx + pins.xs[order0[0]]
+        x2 = cx + pins.xs[order0[1]]
+        y = cy + pins.ys[order0[0]] - 6.5
         dim_h_simple(g, x1, x2, y, f"H pitch={spec.h_pitch_mm:.2f} mm")
 
     if spec.rows >= 2:
-        r0 = sorted([p for p in pins if int(p["row"]) == 0], key=lambda pp: float(pp["x"]))[0]
-        r1 = sorted([p for p in pins if int(p["row"]) == 1], key=lambda pp: float(pp["x"]))[0]
-        y1 = cy + float(r0["y"])
-        y2 = cy + float(r1["y"])
+        i0 = order0[0]
+        i1 = row_orders[1][0]
+        y1 = cy + pins.ys[i0]
+        y2 = cy + pins.ys[i1]
         dim_v_simple_left(g, y1, y2, ox - 18.0, f"V pitch={spec.v_pitch_mm:.2f} mm")
 
-        dx = abs((cx + float(r1["x"])) - (cx + float(r0["x"])))
+        dx = abs(pins.xs[i1] - pins.xs[i0])
         dim_h_simple(
             g,
-            cx + float(r0["x"]),
-            cx + float(r1["x"]),
+            cx + pins.xs[i0],
+            cx + pins.xs[i1],
             cy + opening_h_eff / 2.0 + 4.0,
             f"Delta={dx:.2f} mm",
         )
 
     if include_caption:
-        add_text(g, cx, oy + outer_h + margin_bottom - 8.0,
+        add_text(g, cx, ctx.caption_y,
                  f"{spec.label} - {gender} - {view}",
                  size=2.2, anchor="middle", baseline="middle")
 
-    return ET.tostring(svg, encoding="unicode")
+    g.append(_SVG_FOOTER)
+    return "".join(g)
 
 
 def validate_connector(item: dict) -> List[str]:
@@ -489,6 +637,22 @@ def validate_connector(item: dict) -> List[str]:
 def load_specs() -> List[DSubSpec]:
     if not CATALOG_PATH.exists():
         raise SystemExit(f"Missing catalog: {CATALOG_PATH}")
+    # Keyed by mtime so a long-running caller reparses only when the
+    # catalog file actually changes.
+    return _load_specs_cached(CATALOG_PATH.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_specs_cached(catalog_mtime_ns: int) -> List[DSubSpec]:
+    # A module baked by bake_catalog.py skips parsing and validation; it is
+    # trusted only while its recorded source mtime matches the JSON file.
+    try:
+        import catalog_baked
+        if catalog_baked.CATALOG_MTIME_NS == catalog_mtime_ns:
+            return list(catalog_baked.SPECS)
+    except ImportError:
+        pass
+
     catalog = json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
 
     # Validate all connectors first
@@ -527,20 +691,125 @@ def load_specs() -> List[DSubSpec]:
     return specs
 
 
-def generate_all(out_dir: Path, include_caption: bool = True) -> int:
+def _write_file(fpath: Path, data: bytes) -> None:
+    # Write a sibling temp file and rename over the target. The rename
+    # breaks any dedup hardlink, so rewriting one stem can never mutate a
+    # skipped sibling that shares its inode. Still one write syscall and no
+    # fsync — page-cache writeback is fine for build output.
+    tmp = fpath.parent / (fpath.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, fpath)
+
+
+def _render_spec(job: Tuple[DSubSpec, List[Tuple[str, str, str]], bool, Path]) -> List[Tuple[str, str]]:
+    spec, variants, include_caption, out_dir = job
+    base_pins = precompute_pins(spec)
+    results: List[Tuple[str, str]] = []
+    # Hand writes to a small thread pool so the disk flush of one variant
+    # overlaps with rendering the next; os.write releases the GIL.
+    with ThreadPoolExecutor(max_workers=2) as io_pool:
+        writes = []
+        for gender, view, stem in variants:
+            svg = generate_svg(spec, gender, view, include_caption=include_caption,
+                               base_pins=base_pins)
+            data = svg.encode("utf-8")
+            writes.append(io_pool.submit(_write_file, out_dir / f"{stem}.svg", data))
+            results.append((stem, hashlib.sha1(data).hexdigest()))
+        for w in writes:
+            w.result()
+    return results
+
+
+def _render_executor() -> Executor:
+    """Pick the parallelism model for rendering.
+
+    On free-threaded builds (PEP 703, sys._is_gil_enabled() -> False) plain
+    threads run the CPU-bound render in parallel without process-spawn or
+    pickling overhead. With a GIL, fall back to processes. All shared module
+    state the workers touch (SHELL_GEOMETRY, the lru_caches) is read-only or
+    thread-safe.
+    """
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    if not gil_enabled:
+        return ThreadPoolExecutor(max_workers=os.cpu_count())
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _job_key(spec: DSubSpec, gender: str, view: str, include_caption: bool) -> str:
+    raw = f"{spec!r}|{gender}|{view}|{include_caption}|{GENERATOR_VERSION}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(out_dir: Path) -> Dict[str, str]:
+    manifest_path = out_dir / CACHE_MANIFEST_NAME
+    if manifest_path.exists():
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                return data
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {}
+
+
+def generate_all(out_dir: Path, include_caption: bool = True,
+                 specs: Optional[List[DSubSpec]] = None) -> int:
+    if specs is None:
+        specs = load_specs()
     out_dir.mkdir(parents=True, exist_ok=True)
     genders = ["male", "female"]
     views = ["outside", "solder"]
 
-    written = 0
-    for spec in load_specs():
+    old_manifest = _load_manifest(out_dir)
+    new_manifest: Dict[str, str] = {}
+    jobs = []
+    for spec in specs:
+        variants = []
         for gender in genders:
             for view in views:
-                svg = generate_svg(spec, gender, view, include_caption=include_caption)
                 stem = sanitize_stem(f"{spec.file_tag}_{gender}_{view}")
+                key = _job_key(spec, gender, view, include_caption)
+                new_manifest[stem] = key
                 fpath = out_dir / f"{stem}.svg"
-                fpath.write_text(svg, encoding="utf-8")
-                written += 1
+                if old_manifest.get(stem) == key and fpath.exists():
+                    continue  # unchanged since last build
+                variants.append((gender, view, stem))
+        if variants:
+            jobs.append((spec, variants, include_caption, out_dir))
+
+    written = 0
+    if jobs:
+        # Jobs are grouped per spec so the pin layout is computed once and
+        # shared by all four variants; specs are independent and CPU-bound,
+        # so spread them across cores.
+        results: List[Tuple[str, str]] = []
+        with _render_executor() as executor:
+            for spec_results in executor.map(_render_spec, jobs, chunksize=2):
+                results.extend(spec_results)
+        written = len(results)
+
+        # Content-addressed dedup: byte-identical outputs become hardlinks
+        # to the first file written with that digest.
+        first_by_digest: Dict[str, str] = {}
+        for stem, digest in results:
+            first = first_by_digest.setdefault(digest, stem)
+            if first != stem:
+                fpath = out_dir / f"{stem}.svg"
+                fpath.unlink()
+                os.link(out_dir / f"{first}.svg", fpath)
+
+    # Connectors dropped or renamed in the catalog would otherwise leave
+    # their old drawings behind (sync_tree deliberately preserves this
+    # directory): remove every stem this build no longer produces.
+    for stem in old_manifest.keys() - new_manifest.keys():
+        (out_dir / f"{stem}.svg").unlink(missing_ok=True)
+
+    (out_dir / CACHE_MANIFEST_NAME).write_text(
+        json.dumps(new_manifest, indent=2, sort_keys=True), encoding="utf-8")
     return written
 
 